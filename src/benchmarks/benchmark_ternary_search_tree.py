@@ -2,25 +2,55 @@ import math
 import matplotlib.pyplot as plt
 import numpy as np
 import os
-import random
+import time
 import timeit
 
-from functools import wraps
+from functools import cache, wraps
+from pathlib import Path
 
 from src.ternary_search_tree import TernarySearchTree
 
 DEFAULT_STEPS = 10
+RANDOM_SEED = 0
 BENCHMARK_RESULTS_DIRECTORY = "benchmark_results"
+WORDS_PATH = Path("data/search_trees/corncob_lowercase.txt")
+NANOSECONDS_PER_SECOND = 1e9
+
+# (method, input size, execution time in ns) of every timed run, printed once
+# a benchmark method completes so that I/O stays out of the timed region
+timings: list[tuple[str, int, int]] = []
+
+
+def print_timings() -> None:
+    for (method, size, time_difference) in timings:
+        seconds = time_difference / NANOSECONDS_PER_SECOND
+        print(f"`{method}` ({size}) took: {seconds}s")
+
+    timings.clear()
+
+
+@cache
+def shared_figure():
+    # a single figure is reused by every plot instead of creating a new one
+    return plt.subplots(figsize=(10, 6))
+
+
+def mean_times(results: dict[int, list[int]]) -> tuple[list[int], np.ndarray]:
+    input_sizes = sorted(results)
+    samples = np.array([results[size] for size in input_sizes])
+    return (input_sizes, samples.mean(axis=1) / NANOSECONDS_PER_SECOND)
 
 
 def generate_individual_plot(func):
     @wraps(func)
     def wrap(*args, **kwargs):
         results: dict[int, list[int]] = func(*args, **kwargs)
+        print_timings()
 
         try:
-            # define plot space
-            (_, ax) = plt.subplots(figsize=(10, 6))
+            # define (cleared) plot space
+            (figure, ax) = shared_figure()
+            ax.clear()
 
             # define plot title and axes labels
             ax.set(
@@ -30,13 +60,10 @@ def generate_individual_plot(func):
             )
 
             # add plot gridlines
-            plt.grid()
+            ax.grid()
 
             # plot results
-            plt.plot(
-                list(results.keys()),
-                [sum(result) / len(result) for result in results.values()],
-            )
+            ax.plot(*mean_times(results))
 
             # save plot to file (with timestamp)
             current_time = timeit.default_timer()
@@ -45,7 +72,7 @@ def generate_individual_plot(func):
                 f"{func.__name__}_{current_time}.png"
             )
             os.makedirs(BENCHMARK_RESULTS_DIRECTORY, exist_ok=True)
-            plt.savefig(filename)
+            figure.savefig(filename)
         except Exception:
             print(f"unable to create plot for {func.__name__}")
 
@@ -58,10 +85,12 @@ def generate_aggregate_plot(func):
     @wraps(func)
     def wrap(*args, **kwargs):
         results: dict[str, dict[int, list[int]]] = func(*args, **kwargs)
+        print_timings()
 
         try:
-            # define plot space
-            (_, ax) = plt.subplots(figsize=(10, 6))
+            # define (cleared) plot space
+            (figure, ax) = shared_figure()
+            ax.clear()
 
             # define plot title and axes labels
             ax.set(
@@ -71,20 +100,14 @@ def generate_aggregate_plot(func):
             )
 
             # add plot gridlines
-            plt.grid()
+            ax.grid()
 
             # plot one line per case
-            for case, timings in results.items():
-                input_sizes = sorted(timings.keys())
-                mean_times = [
-                    sum(timings[size]) / len(timings[size])
-                    for size in input_sizes
-                ]
-
-                plt.plot(input_sizes, mean_times, label=case)
+            for case, case_results in results.items():
+                ax.plot(*mean_times(case_results), label=case)
 
             # add legend
-            plt.legend()
+            ax.legend()
 
             # save plot to file (with timestamp)
             current_time = timeit.default_timer()
@@ -93,7 +116,7 @@ def generate_aggregate_plot(func):
                 f"{func.__name__}_{current_time}.png"
             )
             os.makedirs(BENCHMARK_RESULTS_DIRECTORY, exist_ok=True)
-            plt.savefig(filename)
+            figure.savefig(filename)
         except Exception:
             print(f"unable to create plot for {func.__name__}")
 
@@ -103,265 +126,193 @@ def generate_aggregate_plot(func):
 
 
 class Timer:
-    def __init__(self, method: str, size: int, results: list[float]) -> None:
+    def __init__(self, method: str, size: int, results: list[int]) -> None:
         self.method = method
         self.size = size
         self.results = results
         self.tree = TernarySearchTree()
 
     def __enter__(self) -> TernarySearchTree:
-        self.start_time = timeit.default_timer()
+        self.start_time = time.perf_counter_ns()
         return self.tree
 
     def __exit__(self, type, value, traceback) -> None:
-        self.end_time = timeit.default_timer()
+        self.end_time = time.perf_counter_ns()
 
-        # calculate and print time difference
+        # calculate and record time difference (printed by `print_timings`)
         time_difference = self.end_time - self.start_time
         self.results.append(time_difference)
-        print(f"`{self.method}` ({self.size}) took: {time_difference}s")
+        timings.append((self.method, self.size, time_difference))
 
 
 class BenchmarkTernaryTestTree:
     def __init__(self, *args, **kwargs) -> None:
-        with open("data/search_trees/corncob_lowercase.txt") as file:
-            words = [line.strip() for line in file]
+        # read as bytes in a single call, so the tree compares byte values
+        # directly and no per-line decoding or encoding is needed
+        words = WORDS_PATH.read_bytes().splitlines()
 
         # sorted words
         self.sorted_words = sorted(words)
-        self.sorted_populated_tree = TernarySearchTree()
-        for word in self.sorted_words:
-            self.sorted_populated_tree.insert(word)
 
-        # shuffled words
-        self.shuffled_words = words.copy()
-        random.shuffle(self.shuffled_words)
-        self.shuffled_populated_tree = TernarySearchTree()
-        for word in self.shuffled_words:
-            self.shuffled_populated_tree.insert(word)
+        # shuffled words (seeded, so runs are reproducible)
+        rng = np.random.default_rng(RANDOM_SEED)
+        permutation = rng.permutation(len(words))
+        self.shuffled_words = [words[i] for i in permutation.tolist()]
 
         # median ordered words
         self.median_ordered_words = self._median_order(self.sorted_words)
-        self.median_populated_tree = TernarySearchTree()
-        for word in self.median_ordered_words:
-            self.median_populated_tree.insert(word)
-
-    @classmethod
-    def _median_order(cls, words: list[str]) -> list[str]:
-        if not words:
-            return []
-
-        mid = len(words) // 2
-        return (
-            [words[mid]]
-            + cls._median_order(words[:mid])
-            + cls._median_order(words[mid + 1:])
-        )
 
-    @generate_individual_plot
-    def insert_best_case(
-        self,
-        steps: int = DEFAULT_STEPS
-    ) -> dict[int, list[int]]:
-        results = {}
+        self.case_words = {
+            "best": self.median_ordered_words,
+            "average": self.shuffled_words,
+            "worst": self.sorted_words,
+        }
 
-        # words should be in median order for best-case performance
-        # balanced tree
-        limit = math.log10(len(self.median_ordered_words))
-        sizes = np.logspace(1, limit, steps)
+        # input sizes (per number of steps), word slices and populated trees
+        # (per case and size) are computed once and shared by all benchmarks
+        self._sizes: dict[int, list[int]] = {}
+        self._slices: dict[tuple[str, int], tuple[bytes, ...]] = {}
+        self._trees: dict[tuple[str, int], TernarySearchTree] = {}
+
+    @staticmethod
+    def _median_order(words: list[bytes]) -> list[bytes]:
+        result = []
+
+        # pre-order walk over index ranges: the median of a range comes
+        # first, followed by the medians of its left and right halves
+        stack = [(0, len(words))]
+        while stack:
+            (low, high) = stack.pop()
+            if low >= high:
+                continue
+
+            mid = (low + high) // 2
+            result.append(words[mid])
+            stack.append((mid + 1, high))
+            stack.append((low, mid))
+
+        return result
+
+    def _input_sizes(self, steps: int) -> list[int]:
+        if steps not in self._sizes:
+            limit = math.log10(len(self.sorted_words))
+            sizes = np.logspace(1, limit, steps).astype(int)
+            self._sizes[steps] = sizes.tolist()
+        return self._sizes[steps]
+
+    def _words(self, case: str, size: int) -> tuple[bytes, ...]:
+        key = (case, size)
+        if key not in self._slices:
+            self._slices[key] = tuple(self.case_words[case][:size])
+        return self._slices[key]
+
+    def _tree(self, case: str, size: int) -> TernarySearchTree:
+        key = (case, size)
+        if key not in self._trees:
+            tree = self._trees[key] = TernarySearchTree()
+            tree.insert_many(self._words(case, size))
+        return self._trees[key]
+
+    def _time_insert(self, case: str, steps: int) -> dict[int, list[int]]:
+        results = {}
 
-        for size in sizes:
-            words = self.median_ordered_words[:int(size)]
+        for size in self._input_sizes(steps):
+            words = self._words(case, size)
             sample_results = results[len(words)] = []
 
             for _ in range(steps):
                 with Timer(
-                    "insert_best_case",
-                    int(size), sample_results
+                    f"insert_{case}_case", size, sample_results
                 ) as tree:
+                    insert = tree.insert
                     for word in words:
-                        tree.insert(word)
+                        insert(word)
 
         return results
 
-    @generate_individual_plot
-    def insert_average_case(
-        self,
-        steps: int = DEFAULT_STEPS
-    ) -> dict[int, list[int]]:
+    def _time_search(self, case: str, steps: int) -> dict[int, list[int]]:
         results = {}
 
-        # words should be in random order for average-case performance
-        limit = math.log10(len(self.shuffled_words))
-        sizes = np.logspace(1, limit, steps)
-
-        for size in sizes:
-            words = self.shuffled_words[:int(size)]
+        for size in self._input_sizes(steps):
+            words = self._words(case, size)
             sample_results = results[len(words)] = []
+            search = self._tree(case, size).search
 
             for _ in range(steps):
-                with Timer(
-                    "insert_average_case",
-                    int(size), sample_results
-                ) as tree:
+                with Timer(f"search_{case}_case", size, sample_results):
                     for word in words:
-                        tree.insert(word)
+                        search(word)
 
         return results
 
     @generate_individual_plot
-    def insert_worst_case(
+    def insert_best_case(
         self,
         steps: int = DEFAULT_STEPS
     ) -> dict[int, list[int]]:
-        results = {}
+        # words should be in median order for best-case performance
+        # balanced tree
+        return self._time_insert("best", steps)
+
+    @generate_individual_plot
+    def insert_average_case(
+        self,
+        steps: int = DEFAULT_STEPS
+    ) -> dict[int, list[int]]:
+        # words should be in random order for average-case performance
+        return self._time_insert("average", steps)
 
+    @generate_individual_plot
+    def insert_worst_case(
+        self,
+        steps: int = DEFAULT_STEPS
+    ) -> dict[int, list[int]]:
         # words should be sorted alphabetically for worst-case performance
         # unbalanced tree
-        limit = math.log10(len(self.sorted_words))
-        sizes = np.logspace(1, limit, steps)
-
-        for size in sizes:
-            words = self.sorted_words[:int(size)]
-            sample_results = results[len(words)] = []
-
-            for _ in range(steps):
-                with Timer(
-                    "insert_worst_case",
-                    int(size), sample_results
-                ) as tree:
-                    for word in words:
-                        tree.insert(word)
-
-        return results
+        return self._time_insert("worst", steps)
 
     @generate_aggregate_plot
     def insert_all_cases(
         self, steps: int = DEFAULT_STEPS
     ) -> dict[str, dict[int, list[int]]]:
-        results = {"best": {}, "average": {}, "worst": {}}
-
-        cases = {
-            "best": self.median_ordered_words,
-            "average": self.shuffled_words,
-            "worst": self.sorted_words,
+        return {
+            case: self._time_insert(case, steps) for case in self.case_words
         }
 
-        # words should be in median order for best-case performance
-        limit = math.log10(len(self.median_ordered_words))
-        sizes = np.logspace(1, limit, steps)
-
-        for case in cases:
-            for size in sizes:
-                words = cases[case][:int(size)]
-                sample_results = results[case][len(words)] = []
-
-                for _ in range(steps):
-                    with Timer(
-                        f"insert_{case}_case", int(size), sample_results
-                    ) as tree:
-                        for word in words:
-                            tree.insert(word)
-
-        return results
-
     @generate_individual_plot
     def search_best_case(
         self,
         steps: int = DEFAULT_STEPS
     ) -> dict[int, list[int]]:
-        results = {}
-
-        limit = math.log10(len(self.sorted_words))
-        sizes = np.logspace(1, limit, steps)
-
-        for size in sizes:
-            words = self.sorted_words[:int(size)]
-            sample_results = results[len(words)] = []
-
-            # words should be in median order for best-case performance
-            # balanced tree
-            for _ in range(steps):
-                with Timer("search_best_case", int(size), sample_results):
-                    for word in words:
-                        self.median_populated_tree.search(word)
-
-        return results
+        # words should be in median order for best-case performance
+        # balanced tree
+        return self._time_search("best", steps)
 
     @generate_individual_plot
     def search_average_case(
         self,
         steps: int = DEFAULT_STEPS
     ) -> dict[int, list[int]]:
-        results = {}
-
-        limit = math.log10(len(self.sorted_words))
-        sizes = np.logspace(1, limit, steps)
-
-        for size in sizes:
-            words = self.sorted_words[:int(size)]
-            sample_results = results[len(words)] = []
-
-            # words should be in random order for average-case performance
-            for _ in range(steps):
-                with Timer("search_best_case", int(size), sample_results):
-                    for word in words:
-                        self.shuffled_populated_tree.search(word)
-
-        return results
+        # words should be in random order for average-case performance
+        return self._time_search("average", steps)
 
     @generate_individual_plot
     def search_worst_case(
         self,
         steps: int = DEFAULT_STEPS
     ) -> dict[int, list[int]]:
-        results = {}
-
-        limit = math.log10(len(self.sorted_words))
-        sizes = np.logspace(1, limit, steps)
-
-        for size in sizes:
-            words = self.sorted_words[:int(size)]
-            sample_results = results[len(words)] = []
-
-            # words should be sorted alphabetically for worst-case performance
-            # unbalanced tree
-            for _ in range(steps):
-                with Timer("search_best_case", int(size), sample_results):
-                    for word in words:
-                        self.sorted_populated_tree.search(word)
-
-        return results
+        # words should be sorted alphabetically for worst-case performance
+        # unbalanced tree
+        return self._time_search("worst", steps)
 
     @generate_aggregate_plot
     def search_all_cases(
         self, steps: int = DEFAULT_STEPS
     ) -> dict[str, dict[int, list[int]]]:
-        results = {"best": {}, "average": {}, "worst": {}}
-
-        cases: dict[str, TernarySearchTree] = {
-            "best": self.median_populated_tree,
-            "average": self.shuffled_populated_tree,
-            "worst": self.sorted_populated_tree,
+        return {
+            case: self._time_search(case, steps) for case in self.case_words
         }
 
-        limit = math.log10(len(self.sorted_words))
-        sizes = np.logspace(1, limit, steps)
-
-        for case in cases:
-            for size in sizes:
-                words = self.sorted_words[:int(size)]
-                sample_results = results[case][len(words)] = []
-
-                for _ in range(steps):
-                    with Timer(
-                        f"search_{case}_case", int(size), sample_results
-                    ):
-                        for word in words:
-                            cases[case].search(word)
-
-        return results
-
 
 benchmark = BenchmarkTernaryTestTree()
 
@@ -1,50 +1,31 @@
-from dataclasses import dataclass
+from collections.abc import Iterable
 
 
-@dataclass
-class TreeNodeChildren:
-    less_than: "TreeNode | None" = None
-    equals: "TreeNode | None" = None
-    larger_than: "TreeNode | None" = None
+def _render_byte(character: int) -> str:
+    # bytes of multi-byte UTF-8 sequences are not characters on their own
+    return chr(character) if character < 0x80 else f"\\x{character:02x}"
 
 
 class TreeNode:
-    def __init__(self, character: str) -> None:
+    __slots__ = (
+        "character", "terminates", "less_than", "equals", "larger_than"
+    )
+
+    def __init__(self, character: int) -> None:
         self.character = character
         self.terminates = False
-        self.children = TreeNodeChildren()
-
-    @property
-    def character(self) -> str:
-        return self._character
-
-    @character.setter
-    def character(self, character: str) -> None:
-        if len(character) > 1:  # allow empty string
-            raise ValueError("input must be a character string")
-        self._character = character
-
-    @property
-    def terminates(self) -> bool:
-        return self._terminates
-
-    @terminates.setter
-    def terminates(self, terminates: bool) -> None:
-        self._terminates = terminates
-
-    @property
-    def children(self) -> TreeNodeChildren:
-        return self._children
-
-    @children.setter
-    def children(self, children: TreeNodeChildren):
-        self._children = children
+        self.less_than: TreeNode | None = None
+        self.equals: TreeNode | None = None
+        self.larger_than: TreeNode | None = None
 
 
 class TernarySearchTree:
     def __init__(self, root: TreeNode | None = None) -> None:
         self.root = root
 
+        # the empty string has no characters, so it cannot be stored in a node
+        self._contains_empty = False
+
     @property
     def root(self) -> TreeNode | None:
         return self._root
@@ -59,26 +40,31 @@ class TernarySearchTree:
 
         Each node is displayed with its character and '*' if it terminates a
         word. Children are shown with labeled branches: < (less), = (equal),
-        and > (greater).
+        and > (greater). A leading '*' line indicates that the empty string
+        is stored. Characters are stored as UTF-8 bytes: ASCII bytes are shown
+        as-is, other bytes as a '\\xNN' escape.
 
         Returns:
             str: the tree structure as a string.
         """
-        lines = []
+        lines = ["*"] if self._contains_empty else []
 
-        def render(node: TreeNode | None, prefix: str = "", label: str = "") -> str | None:
+        # (node, prefix, label), children pushed in reverse display order
+        stack = [(self.root, "", "")]
+        while stack:
+            (node, prefix, label) = stack.pop()
             if node is None:
-                return
+                continue
 
-            node_repr = node.character + ("*" if node.terminates else "")
+            node_repr = _render_byte(node.character)
+            node_repr += "*" if node.terminates else ""
             lines.append(f"{prefix}{label}{node_repr}")
             indent = prefix + ("│  " if label else "   ")
 
-            render(node.children.less_than, indent, "├─< ")
-            render(node.children.equals, indent, "├─= ")
-            render(node.children.larger_than, indent, "└─> ")
+            stack.append((node.larger_than, indent, "└─> "))
+            stack.append((node.equals, indent, "├─= "))
+            stack.append((node.less_than, indent, "├─< "))
 
-        render(self.root)
         return "\n".join(lines) if lines else "<empty tree>"
 
     def __len__(self) -> int:
@@ -92,79 +78,111 @@ class TernarySearchTree:
         Returns:
             int: the number of distinct strings stored in the tree.
         """
-        def count(node: TreeNode | None) -> int:
+        total = int(self._contains_empty)
+
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
             if node is None:
-                return 0
+                continue
 
-            total = int(node.terminates)
-            total += count(node.children.less_than)
-            total += count(node.children.equals)
-            total += count(node.children.larger_than)
-            return total
+            total += node.terminates
+            stack.append(node.less_than)
+            stack.append(node.equals)
+            stack.append(node.larger_than)
 
-        return count(self.root)
+        return total
 
-    def insert(self, term: str) -> bool:
+    def insert(self, term: str | bytes) -> bool:
         """
         Inserts a string into the ternary search tree.
 
-        All strings, including the empty string, are allowed.
+        All strings, including the empty string, are allowed. Strings are
+        stored as their UTF-8 encoding, one byte per node; `bytes` terms must
+        therefore be valid UTF-8.
 
         Args:
-            term (str): the string to insert into the tree.
+            term (str | bytes): the string to insert into the tree.
 
         Returns:
             bool: True if the string was inserted successfully, False
             otherwise.
+
+        Raises:
+            UnicodeError: if a `str` term cannot be encoded to UTF-8 (e.g. it
+            contains a lone surrogate) or a `bytes` term is not valid UTF-8.
         """
-        def _insert(node: TreeNode | None, term: str, index: int) -> TreeNode:
-            if term == "":
-                character = ""
-            else:
-                character = term[index]
+        if len(term) == 0:
+            self._contains_empty = True
+            return True
 
-            if node is None:
-                node = TreeNode(character)
+        if isinstance(term, str):
+            term = term.encode()
+        else:
+            term.decode()  # reject bytes that `all_strings` cannot decode
+
+        length = len(term)
+        index = 0
+        character = term[0]
+
+        node = self.root
+        if node is None:
+            self.root = node = TreeNode(character)
 
+        while True:
             if character < node.character:
-                node.children.less_than = _insert(
-                    node.children.less_than,
-                    term,
-                    index
-                )
+                if node.less_than is None:
+                    node.less_than = TreeNode(character)
+                node = node.less_than
 
             elif character > node.character:
-                node.children.larger_than = _insert(
-                    node.children.larger_than,
-                    term,
-                    index
-                )
+                if node.larger_than is None:
+                    node.larger_than = TreeNode(character)
+                node = node.larger_than
 
             else:
-                if term == "":
+                index += 1
+                if index == length:
                     node.terminates = True
+                    break
 
-                elif index + 1 == len(term):
-                    node.terminates = True
+                character = term[index]
+                if node.equals is None:
+                    node.equals = TreeNode(character)
+                node = node.equals
 
-                else:
-                    node.children.equals = _insert(
-                        node.children.equals,
-                        term,
-                        index + 1
-                    )
+        return True
+
+    def insert_many(self, terms: Iterable[str | bytes]) -> bool:
+        """
+        Inserts multiple strings into the ternary search tree.
+
+        Equivalent to calling `insert` for every string; terms inserted before
+        a failing term are kept.
+
+        Args:
+            terms (Iterable[str | bytes]): the strings to insert into the
+            tree.
 
-            return node
+        Returns:
+            bool: True if the strings were inserted successfully, False
+            otherwise.
+
+        Raises:
+            UnicodeError: if a term cannot be stored as UTF-8 (see `insert`).
+        """
+        insert = self.insert
+        for term in terms:
+            insert(term)
 
-        self.root = _insert(self.root, term, 0)
         return True
 
-    def search(self, term: str, exact: bool = False) -> bool:
+    def search(self, term: str | bytes, exact: bool = False) -> bool:
         """
         Searches for a string or prefix in the ternary search tree.
 
         Args:
-            term (str): the string to search for.
+            term (str | bytes): the string to search for.
             exact (bool): if True, checks for a full match (must terminate at
             the final node). If False, checks for a valid prefix match.
 
@@ -172,30 +190,37 @@ class TernarySearchTree:
             bool: True if the term or prefix exists in the tree, False
             otherwise.
         """
-        def _search(node: TreeNode | None, index: int) -> bool:
-            if node is None:
-                return False
+        if len(term) == 0:
+            if exact:
+                return self._contains_empty
 
-            if term == "":
-                character = ""
-            else:
-                character = term[index]
+            # every stored string has the empty string as a prefix
+            return self._contains_empty or self.root is not None
+
+        if isinstance(term, str):
+            term = term.encode()
+
+        length = len(term)
+        index = 0
+        character = term[0]
 
+        node = self.root
+        while node is not None:
             if character < node.character:
-                return _search(node.children.less_than, index)
+                node = node.less_than
+
             elif character > node.character:
-                return _search(node.children.larger_than, index)
+                node = node.larger_than
+
             else:
-                if term == "":
-                    return True
-                elif index == len(term) - 1:
+                index += 1
+                if index == length:
                     return node.terminates if exact else True
-                return _search(node.children.equals, index + 1)
 
-        if term == "" and not exact:
-            return bool(len(self))
+                character = term[index]
+                node = node.equals
 
-        return _search(self.root, 0)
+        return False
 
     def all_strings(self) -> list[str]:
         """
@@ -208,20 +233,32 @@ class TernarySearchTree:
         Returns:
             list[str]: a list of all strings stored in the tree.
         """
-        result = []
+        result = [""] if self._contains_empty else []
 
-        def collect(node: TreeNode | None, path: str) -> None:
+        # the prefix is shared by the whole traversal: each node truncates it
+        # to its own depth before appending its character
+        prefix = bytearray()
+
+        # (node, depth, expanded): a node is first expanded into its children
+        # and itself, so that strings are collected in sorted order
+        stack = [(self.root, 0, False)]
+        while stack:
+            (node, depth, expanded) = stack.pop()
             if node is None:
-                return
+                continue
+
+            if not expanded:
+                stack.append((node.larger_than, depth, False))
+                stack.append((node, depth, True))
+                stack.append((node.less_than, depth, False))
+                continue
 
-            collect(node.children.less_than, path)
-            new_path = path + node.character
+            del prefix[depth:]
+            prefix.append(node.character)
 
             if node.terminates:
-                result.append(new_path)
+                result.append(prefix.decode())
 
-            collect(node.children.equals, new_path)
-            collect(node.children.larger_than, path)
+            stack.append((node.equals, depth + 1, False))
 
-        collect(self.root, "")
         return result
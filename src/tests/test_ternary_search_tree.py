@@ -1,21 +1,41 @@
+import random
+import sys
 import unittest
 
+from itertools import zip_longest
+from pathlib import Path
+
 from src.ternary_search_tree import TernarySearchTree
 
 
 class TestTernarySearchTree(unittest.TestCase):
-    def __init__(self, *args, **kwargs) -> None:
-        super().__init__(*args, **kwargs)
-
-        with open('data/search_trees/insert_words.txt') as file:
-            words = [line.strip() for line in file]
-
-        self.insertion_words = words
-
-        with open('data/search_trees/not_insert_words.txt') as file:
-            words = [line.strip() for line in file]
-
-        self.non_insertion_words = words
+    @classmethod
+    def setUpClass(cls) -> None:
+        # read the word lists once for the whole test case; words are
+        # interned so that repeated set lookups can match on identity
+        path = Path('data/search_trees/insert_words.txt')
+        words = path.read_text(encoding='ascii').splitlines()
+        cls.insertion_words = tuple(map(sys.intern, words))
+
+        path = Path('data/search_trees/not_insert_words.txt')
+        words = path.read_text(encoding='ascii').splitlines()
+        cls.non_insertion_words = tuple(map(sys.intern, words))
+
+        # read-only tree shared by the extensive search test
+        cls.unique_words = frozenset(cls.insertion_words)
+        cls.prebuilt_tst = TernarySearchTree()
+
+        # insert in a seeded random order (set iteration order depends on the
+        # hash seed), so the tree is reasonably balanced and has the same
+        # shape on every run
+        shuffled_words = sorted(cls.unique_words)
+        random.Random(0).shuffle(shuffled_words)
+        cls.prebuilt_tst.insert_many(shuffled_words)
+
+        # distinct proper prefixes of the unique words, computed once
+        cls.proper_prefixes = frozenset(
+            word[:i] for word in cls.unique_words for i in range(1, len(word))
+        )
 
     def test_tree_insert_single_word(self) -> None:
         tst = TernarySearchTree()
@@ -34,6 +54,34 @@ class TestTernarySearchTree(unittest.TestCase):
         assert len(tst) == 1
         assert tst.all_strings() == ["word"]
 
+    def test_tree_insert_many(self) -> None:
+        tst = TernarySearchTree()
+        tst.insert_many(["this", "", "list", "is", "this"])
+        assert len(tst) == 4
+        assert tst.all_strings() == ["", "is", "list", "this"]
+
+    def test_tree_insert_many_matches_insert(self) -> None:
+        tst = TernarySearchTree()
+        for word in self.insertion_words:
+            tst.insert(word)
+
+        bulk_tst = TernarySearchTree()
+        bulk_tst.insert_many(self.insertion_words)
+        assert repr(bulk_tst) == repr(tst)
+
+    def test_tree_insert_many_keeps_terms_before_failure(self) -> None:
+        empty_tst = TernarySearchTree()
+        populated_tst = TernarySearchTree()
+        populated_tst.insert("word")
+
+        for tst in (empty_tst, populated_tst):
+            with self.assertRaises(UnicodeDecodeError):
+                tst.insert_many(["abc", b"\xff"])
+            assert tst.search("abc", exact=True) is True
+
+        assert empty_tst.all_strings() == ["abc"]
+        assert populated_tst.all_strings() == ["abc", "word"]
+
     def test_tree_insert_empty_string(self) -> None:
         tst = TernarySearchTree()
         tst.insert("")
@@ -80,77 +128,151 @@ class TestTernarySearchTree(unittest.TestCase):
         tst.insert("word")
         assert tst.search("", exact=False) is True
 
-    def test_tree_length(self) -> None:
+    def test_tree_non_string_term(self) -> None:
         tst = TernarySearchTree()
-        assert len(tst) == 0
-
-        for word in self.insertion_words:
-            tst.insert(word)
-
-        unique_words = set(self.insertion_words)
-        assert len(tst) == len(unique_words)
+        with self.assertRaises(TypeError):
+            tst.insert(None)
+        with self.assertRaises(TypeError):
+            tst.search(None)
+        with self.assertRaises(TypeError):
+            tst.search(0, exact=True)
 
-    def test_tree_all_strings(self) -> None:
-        tst = TernarySearchTree()
+        assert len(tst) == 0
         assert tst.all_strings() == []
 
-        words = ["this", "list", "is", "not", "sorted"]
+    def test_tree_search_bytes_term(self) -> None:
+        tst = TernarySearchTree()
+        tst.insert(b"word")
+        tst.insert("wood")
+        assert tst.search("word", exact=True) is True
+        assert tst.search(b"wood", exact=True) is True
+        assert tst.search(b"wo", exact=False) is True
+        assert tst.all_strings() == ["wood", "word"]
 
-        for word in words:
+    def test_tree_non_ascii_strings(self) -> None:
+        tst = TernarySearchTree()
+        for word in ["日本", "é", "z", "e"]:
             tst.insert(word)
 
-        assert tst.all_strings() == sorted(words)
+        assert len(tst) == 4
+        assert tst.search("é", exact=True) is True
+        assert tst.search("日本", exact=True) is True
+        assert tst.search("日", exact=False) is True
+        assert tst.search("日", exact=True) is False
+        assert tst.search("日本".encode(), exact=True) is True
+        assert tst.all_strings() == ["e", "z", "é", "日本"]
 
-    def test_tree_search_word_extensive(self) -> None:
+    def test_tree_repr_non_ascii_string(self) -> None:
         tst = TernarySearchTree()
-        unique_words = set(self.insertion_words)
+        tst.insert("é")
+        assert repr(tst) == "\\xc3\n   ├─= \\xa9*"
 
-        for word in unique_words:
-            tst.insert(word)
+    def test_tree_insert_invalid_utf8(self) -> None:
+        tst = TernarySearchTree()
+        with self.assertRaises(UnicodeDecodeError):
+            tst.insert(b"\xff")
+        with self.assertRaises(UnicodeEncodeError):
+            tst.insert("\ud800")
 
-        for word in unique_words:
-            assert tst.search(word, exact=True) is True
+        assert len(tst) == 0
+        assert tst.all_strings() == []
 
-    def test_tree_search_word_extensive_fail(self) -> None:
+    def test_tree_length(self) -> None:
         tst = TernarySearchTree()
-        unique_words = set(self.insertion_words)
+        assert len(tst) == 0
 
-        for word in unique_words:
-            tst.insert(word)
+        tst.insert_many(self.insertion_words)
 
-        for word in unique_words:
-            for i in range(len(word), 0, -1):
-                prefix = word[:i]
-                if prefix not in unique_words:
-                    assert tst.search(prefix, exact=True) is False
+        unique_words = self.unique_words
+        assert len(tst) == len(unique_words)
 
-    def test_tree_search_prefix_extensive(self) -> None:
+    def test_tree_all_strings(self) -> None:
         tst = TernarySearchTree()
-        unique_words = set(self.insertion_words)
+        assert tst.all_strings() == []
 
-        for word in unique_words:
+        words = ["this", "list", "is", "not", "sorted"]
+
+        for word in words:
             tst.insert(word)
 
-        for word in unique_words:
-            for i in range(len(word) - 1, 0, -1):
-                prefix = word[:i]
-                assert tst.search(prefix, exact=False) is True
+        assert tst.all_strings() == sorted(words)
 
-    def test_tree_search_prefix_extensive_non_inserted(self) -> None:
+    def test_tree_deeper_than_recursion_limit(self) -> None:
+        depth = sys.getrecursionlimit() + 100
+        word = "a" * depth
         tst = TernarySearchTree()
-        unique_words = set(self.insertion_words)
-
+        tst.insert(word)
+        tst.insert(word[:-1] + "b")
+
+        assert tst.search(word, exact=True) is True
+        assert tst.search(word[:-1], exact=True) is False
+        assert tst.search(word[:-1]) is True
+        assert len(tst) == 2
+        assert tst.all_strings() == [word, word[:-1] + "b"]
+        assert len(repr(tst).splitlines()) == depth + 1
+
+    def test_tree_search_extensive(self) -> None:
+        # bound once; `exact` is passed positionally in the loops below
+        search = self.prebuilt_tst.search
+        unique_words = self.unique_words
+
+        # collect the failing terms per property and report them all at once
+        words_not_found = []
         for word in unique_words:
-            tst.insert(word)
-
+            if search(word, True) is not True:
+                words_not_found.append(word)
+
+        prefixes_not_found = []
+        missing_prefixes_found = []
+        for prefix in self.proper_prefixes:
+            if search(prefix, False) is not True:
+                prefixes_not_found.append(prefix)
+
+            if prefix not in unique_words:
+                if search(prefix, True) is not False:
+                    missing_prefixes_found.append(prefix)
+
+        # a prefix search must not find any non-inserted word, which only
+        # holds if none of them is an inserted word or a prefix of one
+        non_inserted_words_stored = []
+        non_inserted_words_found = []
         for word in self.non_insertion_words:
-            assert tst.search(word, exact=False) is False
+            if word in unique_words or word in self.proper_prefixes:
+                non_inserted_words_stored.append(word)
+
+            if search(word, False) is not False:
+                non_inserted_words_found.append(word)
+
+        self.assertEqual(
+            words_not_found, [],
+            "inserted words not found by an exact search"
+        )
+        self.assertEqual(
+            prefixes_not_found, [],
+            "proper prefixes not found by a prefix search"
+        )
+        self.assertEqual(
+            missing_prefixes_found, [],
+            "missing prefixes found by an exact search"
+        )
+        self.assertEqual(
+            non_inserted_words_stored, [],
+            "non-inserted words that are inserted words or prefixes of them"
+        )
+        self.assertEqual(
+            non_inserted_words_found, [],
+            "non-inserted words found by a prefix search"
+        )
 
     def test_tree_all_strings_extensive_sorted(self) -> None:
         tst = TernarySearchTree()
-        unique_words = set(self.insertion_words)
+        unique_words = self.unique_words
 
-        for word in self.insertion_words:
-            tst.insert(word)
+        tst.insert_many(self.insertion_words)
 
-        assert tst.all_strings() == sorted(unique_words)
+        # compare pairwise, stopping at the first mismatch; zip_longest pads
+        # the shorter side with None, so a length mismatch fails as well
+        for (actual, expected) in zip_longest(
+            tst.all_strings(), sorted(unique_words)
+        ):
+            assert actual == expected